@@ -29,7 +29,7 @@ by subclassing :py:class:`config_resolver.handler.Handler` and passing it to
 
 from os.path import dirname, join
 
-from .core import from_string, get_config
+from .core import clear_cache, from_string, get_config
 from .exc import NoVersionError
 
 with open(join(dirname(__file__), "version.txt")) as fptr:
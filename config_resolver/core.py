@@ -4,11 +4,13 @@ Core functionality of :py:mod:`config_resolver`
 
 import logging
 import stat
+from collections import OrderedDict
 from functools import lru_cache
 from logging import Filter, Logger
 from os import getcwd, getenv, pathsep
 from os import stat as get_stat
-from os.path import abspath, exists, expanduser, join
+from os import stat_result
+from os.path import abspath, expanduser, join
 from typing import (
     Any,
     Dict,
@@ -27,7 +29,10 @@ from config_resolver.handler.ini import IniHandler
 
 from .exc import NoVersionError
 from .handler.base import Handler
-from .util import PrefixFilter
+from .util import PrefixFilter, parse_version
+
+#: File-mode bits which make a file readable by "group" and "other".
+_INSECURE_MASK = stat.S_IRGRP | stat.S_IROTH
 
 
 class ConfigID(NamedTuple):
@@ -47,11 +52,34 @@ class LookupResult(NamedTuple):
     meta: LookupMetadata
 
 
+class EnvNames(NamedTuple):
+    path: str
+    filename: str
+
+
 class FileReadability(NamedTuple):
     is_readable: bool
     filename: str
     reason: str
     version: Optional[Version]
+    parsed: Any = None
+
+
+Fingerprint = Tuple[Any, ...]
+ResultCacheEntry = Tuple[Fingerprint, LookupResult]
+
+#: The maximum number of entries kept in each of the caches below.
+_CACHE_SIZE = 32
+
+#: Results of :py:func:`get_config` calls which requested caching. The values
+#: contain the file fingerprints of the active path and the lookup result.
+#: The least recently used entries are dropped first.
+_RESULT_CACHE: "OrderedDict[Tuple[Any, ...], ResultCacheEntry]" = OrderedDict()
+
+#: Files which have been parsed by a handler during lookups which requested
+#: caching. The values contain the file signature at parse-time and the
+#: parsed config instance. The least recently used entries are dropped first.
+_PARSE_CACHE: "OrderedDict[Tuple[Any, str], Tuple[Any, Any]]" = OrderedDict()
 
 
 def from_string(
@@ -155,6 +183,20 @@ def get_config(
         If set to ``True``, files which are world-readable will be ignored.
         This forces you to have secure file-access rights because the file will
         be skipped if the rights are too open.
+
+    **cache** (default=``False``)
+        If set to ``True``, the result is kept in memory and returned again by
+        subsequent calls with the same arguments, as long as none of the files
+        in the active path were created, modified or removed in the meantime.
+        Note that this returns the *same* config instance to each caller.
+        Parsed files are kept as well and are reused by other cached lookups.
+        Use :py:func:`clear_cache` to drop all cached results.
+
+    **first_match** (default=``False``)
+        If set to ``True``, only one file is loaded: the readable file with the
+        highest precedence. The search path is then inspected starting with
+        its *last* element and the lookup stops at the first file which could
+        be loaded. Files with lower precedence are not opened at all.
     """
     concrete_handler: Type[Handler[Any]] = handler or IniHandler
     config_id = ConfigID(group_name, app_name)
@@ -166,19 +208,23 @@ def get_config(
         "require_load": False,
         "version": None,
         "secure": False,
+        "cache": False,
+        "first_match": False,
     }
     if lookup_options:
         default_options.update(lookup_options)
 
     secure = cast(bool, default_options["secure"])
     require_load = default_options["require_load"]
+    first_match = cast(bool, default_options["first_match"])
+    use_cache = cast(bool, default_options["cache"])
     search_path = cast(str, default_options["search_path"])
     filename = cast(str, default_options["filename"])
     filename = effective_filename(config_id, filename)
     requested_version = cast(str, default_options["version"])
     version = None
     if requested_version:
-        version = Version(requested_version)
+        version = parse_version(requested_version)
 
     loaded_files = []  # type: List[str]
 
@@ -187,13 +233,43 @@ def get_config(
     # Store the complete list of all inspected items
     active_path = [join(_, filename) for _ in search_path_]
 
+    cache_key = ()  # type: Tuple[Any, ...]
+    fingerprint = ()  # type: Fingerprint
+    if use_cache:
+        cache_key = (
+            config_id,
+            concrete_handler,
+            tuple(active_path),
+            requested_version,
+            secure,
+            require_load,
+            first_match,
+        )
+        fingerprint = _fingerprint(active_path)
+        cached = _cache_get(_RESULT_CACHE, cache_key)
+        if cached and cached[0] == fingerprint:
+            log.debug("Returning cached config for %r", active_path)
+            return cached[1]
+
     output = concrete_handler.empty()
-    found_files = find_files(config_id, search_path_, filename)
+    merge_parsed = _can_merge_parsed(concrete_handler)
+    if first_match:
+        # Look at the most important files first, so the lookup can stop at
+        # the first match.
+        found_files = active_path[::-1]
+    else:
+        found_files = active_path
 
     current_version = version
+    action = "Loading initial"
     for filename in found_files:
         readability = is_readable(
-            config_id, filename, current_version, secure, concrete_handler
+            config_id,
+            filename,
+            current_version,
+            secure,
+            concrete_handler,
+            use_cache,
         )
         if not current_version and readability.version:
             # Automatically "lock-in" a version number if one is found.
@@ -209,10 +285,15 @@ def get_config(
             )
             current_version = readability.version
         if readability.is_readable:
-            action = "Updating" if loaded_files else "Loading initial"
             log.info("%s config from %s", action, filename)
-            concrete_handler.update_from_file(output, filename)
+            if merge_parsed:
+                concrete_handler.update_from_config(output, readability.parsed)
+            else:
+                concrete_handler.update_from_file(output, filename)
             loaded_files.append(filename)
+            action = "Updating"
+            if first_match:
+                break
         else:
             log.debug(
                 "Skipping unreadable file %s (%s)", filename, readability.reason
@@ -230,23 +311,132 @@ def get_config(
             "was %r" % (filename, search_path_)
         )
 
-    return LookupResult(
+    result = LookupResult(
         output,
         LookupMetadata(active_path, loaded_files, config_id, prefix_filter),
     )
+    if use_cache:
+        _cache_put(_RESULT_CACHE, cache_key, (fingerprint, result))
+    return result
+
+
+def clear_cache() -> None:
+    """
+    Removes all results which were cached by :py:func:`get_config` (see the
+    ``cache`` lookup option) and all cached parsed files.
+    """
+    _RESULT_CACHE.clear()
+    _PARSE_CACHE.clear()
+
+
+def _signature(info: stat_result) -> Tuple[int, int, int]:
+    """
+    Returns a value from the stat-result *info* of a file which changes
+    whenever that file is modified (including changes to the file-mode).
+    """
+    return (info.st_mtime_ns, info.st_ctime_ns, info.st_size)
+
+
+def _file_signature(filename: str) -> Optional[Tuple[int, int, int]]:
+    """
+    Returns the signature (see :py:func:`_signature`) of *filename* or
+    ``None`` if the file does not exist.
+    """
+    try:
+        info = get_stat(filename)
+    except OSError:
+        return None
+    return _signature(info)
+
+
+def _fingerprint(filenames: List[str]) -> Fingerprint:
+    """
+    Returns a value which changes whenever one of the files in *filenames* is
+    created, modified or removed.
+    """
+    return tuple(_file_signature(filename) for filename in filenames)
+
+
+def _parse_file(
+    handler: "Type[Handler[Any]]", filename: str, info: stat_result
+) -> Any:
+    """
+    Returns the config instance which *handler* creates from *filename*.
+    *info* must contain the current stat-result of that file.
+
+    The result is kept in memory and reused until the file changes on disk.
+    The returned instance is shared and must not be modified!
+    """
+    key = (handler, abspath(filename))
+    signature = _signature(info)
+    cached = _cache_get(_PARSE_CACHE, key)
+    if cached and cached[0] == signature:
+        return cached[1]
+    parsed = handler.from_filename(filename)
+    _cache_put(_PARSE_CACHE, key, (signature, parsed))
+    return parsed
+
+
+def _cache_get(cache: "OrderedDict[Any, Any]", key: Any) -> Any:
+    """
+    Returns the value stored for *key* in *cache* (or ``None``) and marks it
+    as most recently used.
+    """
+    value = cache.get(key)
+    if value is not None:
+        cache.move_to_end(key)
+    return value
+
+
+def _cache_put(cache: "OrderedDict[Any, Any]", key: Any, value: Any) -> None:
+    """
+    Stores *value* for *key* in *cache*, dropping the least recently used
+    entries if the cache grows beyond :py:data:`_CACHE_SIZE` entries.
+    """
+    cache[key] = value
+    cache.move_to_end(key)
+    while len(cache) > _CACHE_SIZE:
+        cache.popitem(last=False)
+
+
+def _can_merge_parsed(handler: "Type[Handler[Any]]") -> bool:
+    """
+    Returns True if *handler* can merge already parsed config instances using
+    ``update_from_config``.
+
+    The parsed instances are created by ``from_filename``. Merging them only
+    gives the same result as ``empty`` followed by ``update_from_file`` if all
+    four methods come from the same class. A subclass which overrides any of
+    them (for example ``empty`` to make option names case-sensitive) must be
+    merged through ``update_from_file``.
+    """
+
+    def owner(name: str) -> type:
+        return next(cls for cls in handler.__mro__ if name in vars(cls))
+
+    merge_owner = owner("update_from_config")
+    if merge_owner is Handler:
+        return False
+    return all(
+        owner(name) is merge_owner
+        for name in ("empty", "from_filename", "update_from_file")
+    )
 
 
-def _is_world_readable(filename: str) -> bool:
+def _is_world_readable(filename: str, mode: Optional[int] = None) -> bool:
     """
     Returns True if the given file is readable by everyone on the system (has
     readable flags for "group" and "other"), False otherwise
+
+    If the file-mode is already known, it can be passed in via *mode* to avoid
+    reading it again from disk.
     """
-    mode = get_stat(filename).st_mode
-    matching_modes = (mode & stat.S_IRGRP) or (mode & stat.S_IROTH)
-    return bool(matching_modes)
+    if mode is None:
+        mode = get_stat(filename).st_mode
+    return bool(mode & _INSECURE_MASK)
 
 
-@lru_cache(5)
+@lru_cache(32)
 def prefixed_logger(
     config_id: Optional[ConfigID],
 ) -> Tuple[Logger, Optional[Filter]]:
@@ -257,19 +447,19 @@ def prefixed_logger(
     group- and application-name from the config.
 
     The call to this function is cached to ensure we only have one instance in
-    memory.
+    memory. If the cached value was evicted, the filter which is already
+    installed on the logger is returned again.
     """
     if config_id is None:
         log = logging.getLogger("config_resolver")
         return log, None
-    log = logging.getLogger(
-        "config_resolver.{}.{}".format(config_id.group, config_id.app)
-    )
-    prefix_filter = PrefixFilter(
-        "group={}:app={}".format(config_id.group, config_id.app), separator=":"
-    )
-    if prefix_filter not in log.filters:
-        log.addFilter(prefix_filter)
+    group, app = config_id
+    log = logging.getLogger(f"config_resolver.{group}.{app}")
+    prefix_filter = PrefixFilter(f"group={group}:app={app}", separator=":")
+    for installed_filter in log.filters:
+        if installed_filter == prefix_filter:
+            return log, cast(Filter, installed_filter)
+    log.addFilter(prefix_filter)
     return log, prefix_filter
 
 
@@ -287,10 +477,10 @@ def get_xdg_dirs(config_id: ConfigID) -> List[str]:
     config_dirs = getenv("XDG_CONFIG_DIRS", "")
     if config_dirs:
         log.debug("XDG_CONFIG_DIRS is set to %r", config_dirs)
-        output: List[str] = []
-        for path in reversed(config_dirs.split(":")):
-            output.append(join(path, config_id.group, config_id.app))
-        return output
+        return [
+            join(path, config_id.group, config_id.app)
+            for path in reversed(config_dirs.split(pathsep))
+        ]
     return [f"/etc/xdg/{config_id.group}/{config_id.app}"]
 
 
@@ -343,27 +533,32 @@ def effective_path(config_id: ConfigID, search_path: str = "") -> List[str]:
     """
     log, _ = prefixed_logger(config_id)
 
-    # default search path
-    path = (
-        [f"/etc/{config_id.group}/{config_id.app}"]
-        + get_xdg_dirs(config_id)
-        + [
-            get_xdg_home(config_id),
-            join(getcwd(), f".{config_id.group}", config_id.app),
-        ]
-    )
+    # The environment variable takes absolute precedence unless it is prefixed
+    # with a '+'. In that case nothing else needs to be looked up.
+    env_path_name = env_names(config_id).path
+    env_path = getenv(env_path_name)
+    if env_path and not env_path.startswith("+"):
+        log.info(
+            "Configuration search path was overridden with "
+            "%r by the environment variable %r.",
+            env_path,
+            env_path_name,
+        )
+        return env_path.split(pathsep)
 
     # If a path was passed directly to this instance, override the path.
+    # Otherwise use the default search path.
     if search_path:
         path = search_path.split(pathsep)
+    else:
+        path = [
+            f"/etc/{config_id.group}/{config_id.app}",
+            *get_xdg_dirs(config_id),
+            get_xdg_home(config_id),
+            join(getcwd(), f".{config_id.group}", config_id.app),
+        ]
 
-    # Next, consider the environment variables...
-    env_path_name = "{}_{}_PATH".format(
-        config_id.group.upper(), config_id.app.upper()
-    )
-    env_path = getenv(env_path_name)
-
-    if env_path and env_path.startswith("+"):
+    if env_path:
         # If prefixed with a '+', append the path elements
         additional_paths = env_path[1:].split(pathsep)
         log.info(
@@ -372,15 +567,6 @@ def effective_path(config_id: ConfigID, search_path: str = "") -> List[str]:
             env_path_name,
         )
         path.extend(additional_paths)
-    elif env_path:
-        # Otherwise, override again. This takes absolute precedence.
-        log.info(
-            "Configuration search path was overridden with "
-            "%r by the environment variable %r.",
-            env_path,
-            env_path_name,
-        )
-        path = env_path.split(pathsep)
 
     return path
 
@@ -417,13 +603,14 @@ def effective_filename(config_id: ConfigID, config_filename: str) -> str:
     """
     log, _ = prefixed_logger(config_id)
 
-    env_filename = getenv(env_name(config_id))
+    env_filename_name = env_names(config_id).filename
+    env_filename = getenv(env_filename_name)
     if env_filename:
         log.info(
             "Configuration filename was overridden with %r "
             "by the environment variable %s.",
             env_filename,
-            env_name(config_id),
+            env_filename_name,
         )
         config_filename = env_filename
 
@@ -435,7 +622,20 @@ def env_name(config_id: ConfigID) -> str:
     Return the name of the environment variable which contains the file-name to
     load.
     """
-    return f"{config_id.group.upper()}_{config_id.app.upper()}_FILENAME"
+    return env_names(config_id).filename
+
+
+@lru_cache(32)
+def env_names(config_id: ConfigID) -> EnvNames:
+    """
+    Return the names of the environment variables which can be used to
+    override the search-path and the file-name for *config_id*.
+
+    The call to this function is cached as the names never change for a given
+    config-ID.
+    """
+    prefix = f"{config_id.group.upper()}_{config_id.app.upper()}"
+    return EnvNames(f"{prefix}_PATH", f"{prefix}_FILENAME")
 
 
 def is_readable(
@@ -444,6 +644,7 @@ def is_readable(
     version: Optional[Version] = None,
     secure: bool = False,
     handler: "Optional[Type[Handler[Any]]]" = None,
+    cache: bool = False,
 ) -> FileReadability:
     """
     Check if ``filename`` can be read. Will return boolean which is True if
@@ -453,20 +654,38 @@ def is_readable(
     :param version: The expected version, that should be found in the file.
     :param secure: Whether we should avoid loading insecure files or not.
     :param handler: The handler to be used to open and parse the file.
+    :param cache: Whether a previously parsed instance of the file may be
+        reused if the file did not change.
     """
     log, _ = prefixed_logger(config_id)
     handler_ = handler or IniHandler  # type: Type[Handler[Any]]
 
-    if not exists(filename):
+    # A single "stat" call serves the existence check, the parse-cache and
+    # the file-mode check.
+    try:
+        info = get_stat(filename)
+    except OSError:
         return FileReadability(False, filename, "File not found", None)
+    if not stat.S_ISREG(info.st_mode):
+        return FileReadability(False, filename, "Not a regular file", None)
     log.debug("Checking if %s is readable.", filename)
 
+    # The file-mode is already known at this point. Insecure files are
+    # skipped before spending any time on parsing them.
+    if secure and _is_world_readable(filename, info.st_mode):
+        msg = "File %r is not secure enough. Change it's mode to 600"
+        log.warning(msg, filename)
+        return FileReadability(False, filename, msg, None)
+
     insecure_readable = True
     unreadable_reason = "<unknown>"
 
     # Check if the file is version-compatible with this instance.
     try:
-        config_instance = handler_.from_filename(filename)
+        if cache:
+            config_instance = _parse_file(handler_, filename, info)
+        else:
+            config_instance = handler_.from_filename(filename)
     except:  #  pylint: disable=bare-except
         log.critical("Unable to read %r", abspath(filename), exc_info=True)
         return FileReadability(
@@ -503,11 +722,10 @@ def is_readable(
             insecure_readable = False
             unreadable_reason = msg
 
-    if insecure_readable and secure:
-        if _is_world_readable(filename):
-            msg = "File %r is not secure enough. Change it's mode to 600"
-            log.warning(msg, filename)
-            return FileReadability(False, filename, msg, instance_version)
     return FileReadability(
-        insecure_readable, filename, unreadable_reason, instance_version
+        insecure_readable,
+        filename,
+        unreadable_reason,
+        instance_version,
+        config_instance,
     )
@@ -55,3 +55,19 @@ class Handler(Generic[TConfig]):
         The config instance in *data* will be modified in-place!
         """
         raise NotImplementedError("Not yet implemented")
+
+    @staticmethod
+    def update_from_config(config: TConfig, other: TConfig) -> None:
+        """
+        Updates an existing config instance with the values of another config
+        instance (as returned by :py:meth:`from_filename`).
+
+        The config instance in *config* will be modified in-place! The
+        instance in *other* must not be modified.
+
+        Implementing this is optional but avoids parsing a file twice. It is
+        only used if it is implemented in the same class as :py:meth:`empty`,
+        :py:meth:`from_filename` and :py:meth:`update_from_file`. Otherwise
+        files are merged using :py:meth:`update_from_file`.
+        """
+        raise NotImplementedError("Not yet implemented")
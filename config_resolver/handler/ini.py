@@ -2,17 +2,110 @@
 Handler for INI files
 """
 
+import re
 from configparser import ConfigParser
-from typing import Optional
+from typing import Callable, Dict, List, Optional, Set
 
 from packaging.version import Version
 
+from ..util import parse_version
 from .base import Handler
 
+#: Matches a section header which is alone on its line
+_HEADER_RE = re.compile(r"\[([^\]]+)\]$")
+
+#: Matches a simple single-line ``key = value`` (or ``key: value``) option
+_KV_RE = re.compile(r"([^=:\s][^=:]*?)\s*[=:]\s*(.*)")
+
+
+def _fast_parse(
+    lines: List[str], optionxform: Callable[[str], str] = str.lower
+) -> Optional[Dict[str, Dict[str, str]]]:
+    """
+    Parse the "simple" subset of the INI format (section headers, single-line
+    options and full-line comments) from *lines* into a nested dictionary.
+    *optionxform* must be the option-name transformation of the target config
+    and is used to detect duplicate options.
+
+    This avoids the overhead of the generic :py:mod:`configparser` tokenizer
+    for the most common config files. If anything outside of that subset is
+    encountered (continuation lines, duplicates, options without section, ...)
+    this returns ``None`` and the caller should fall back to
+    :py:meth:`configparser.ConfigParser.read_file`.
+    """
+    output = {}  # type: Dict[str, Dict[str, str]]
+    section = None  # type: Optional[Dict[str, str]]
+    seen_keys = set()  # type: Set[str]
+    for line in lines:
+        stripped = line.strip()
+        if not stripped or stripped[0] in "#;":
+            continue
+        if line[0].isspace():
+            return None
+        match = _HEADER_RE.match(stripped)
+        if match:
+            name = match.group(1)
+            if name in output:
+                return None
+            section = output[name] = {}
+            seen_keys = set()
+            continue
+        if stripped[0] == "[":
+            # Anything else starting with a bracket is parsed as a section
+            # header (with trailing text) by configparser.
+            return None
+        match = _KV_RE.match(stripped)
+        if not match or section is None:
+            return None
+        key, value = match.groups()
+        normalised_key = optionxform(key)
+        if normalised_key in seen_keys:
+            return None
+        seen_keys.add(normalised_key)
+        section[key] = value
+    return output
+
+
+def _read_file(config: ConfigParser, filename: str) -> None:
+    """
+    Update *config* in-place with the contents of *filename*.
+    """
+    with open(filename) as fptr:
+        lines = fptr.readlines()
+    parsed = _fast_parse(lines, config.optionxform)
+    if parsed is None:
+        config.read_file(lines, source=filename)
+        return
+    _store(config, parsed)
+
+
+def _store(config: ConfigParser, sections: Dict[str, Dict[str, str]]) -> None:
+    """
+    Update *config* in-place with the raw values in *sections*.
+
+    Values are stored as-is (without interpolation checks), exactly like
+    ``ConfigParser.read_file`` does.
+    """
+    # pylint: disable=protected-access
+    optionxform = config.optionxform
+    for name, options in sections.items():
+        if name == config.default_section:
+            target = config._defaults  # type: ignore
+        else:
+            if not config.has_section(name):
+                config.add_section(name)
+            target = config._sections[name]  # type: ignore
+        for key, value in options.items():
+            target[optionxform(key)] = value
+
 
 class IniHandler(Handler[ConfigParser]):
     """
     A config-resolver handler capable of reading ".ini" files.
+
+    Simple files are parsed with a lightweight parser. Files using more
+    advanced features of the INI format (like multi-line values) are handed
+    over to :py:class:`configparser.ConfigParser`.
     """
 
     DEFAULT_FILENAME = "app.ini"
@@ -30,8 +123,7 @@ class IniHandler(Handler[ConfigParser]):
     @staticmethod
     def from_filename(filename: str) -> ConfigParser:
         parser = ConfigParser()
-        with open(filename) as fptr:
-            parser.read_file(fptr)
+        _read_file(parser, filename)
         return parser
 
     @staticmethod
@@ -41,10 +133,32 @@ class IniHandler(Handler[ConfigParser]):
         ):
             return None
         raw_value = config.get("meta", "version")
-        parsed = Version(raw_value)
+        parsed = parse_version(raw_value)
         return parsed
 
     @staticmethod
     def update_from_file(config: ConfigParser, filename: str) -> None:
-        with open(filename) as fptr:
-            config.read_file(fptr)
+        _read_file(config, filename)
+
+    @staticmethod
+    def update_from_config(config: ConfigParser, other: ConfigParser) -> None:
+        # pylint: disable=protected-access
+        sections = {other.default_section: other._defaults}  # type: ignore
+        sections.update(other._sections)  # type: ignore
+        _store(config, sections)
+
+    @staticmethod
+    def as_dict(config: ConfigParser) -> Dict[str, Dict[str, str]]:
+        """
+        Returns all (interpolated) values of *config* as a plain nested
+        dictionary of the form ``{section: {option: value}}``.
+
+        Lookups in the returned dictionary are considerably faster than
+        :py:meth:`configparser.ConfigParser.get`. This is useful for
+        performance-sensitive code which reads the same values repeatedly.
+        The dictionary is a snapshot and is not updated with the config.
+        """
+        return {
+            section: dict(config.items(section))
+            for section in config.sections()
+        }
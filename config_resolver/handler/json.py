@@ -7,6 +7,7 @@ from typing import Any, Dict, Optional
 
 from packaging.version import Version
 
+from ..util import parse_version
 from .base import Handler
 
 TJsonConfig = Dict[str, Any]
@@ -17,6 +18,11 @@ class JsonHandler(Handler[TJsonConfig]):
     A config-resolver handler capable of reading ".json" files.
     """
 
+    # "update_from_config" is optional. JSON files are merged using
+    # "update_from_file" because merging a parsed dict safely would need a
+    # deep copy.
+    # pylint: disable = abstract-method
+
     DEFAULT_FILENAME = "app.json"
 
     @staticmethod
@@ -38,7 +44,7 @@ class JsonHandler(Handler[TJsonConfig]):
         if "meta" not in config or "version" not in config["meta"]:
             return None
         raw_value = config["meta"]["version"]
-        parsed = Version(raw_value)
+        parsed = parse_version(raw_value)
         return parsed
 
     @staticmethod
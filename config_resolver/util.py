@@ -4,9 +4,23 @@ Helpers and utilities for the config_resolver package.
 This module contains stuff which is not directly impacting the business logic of
 the config_resolver package.
 """
+from functools import lru_cache
 from logging import Filter, LogRecord
 from typing import Any
 
+from packaging.version import Version
+
+
+@lru_cache(32)
+def parse_version(value: str) -> Version:
+    """
+    Parse the version string in *value*.
+
+    The same few version strings are usually parsed over and over again (once
+    for each lookup and each file), so the result is cached.
+    """
+    return Version(value)
+
 
 class PrefixFilter(Filter):
     """
@@ -23,6 +37,7 @@ class PrefixFilter(Filter):
         super().__init__()
         self._prefix = prefix
         self._separator = separator
+        self._full_prefix = prefix + separator
 
     def __eq__(self, other: Any) -> bool:
         # NOTE: using ``isinstance(other, PrefixFilter)`` did NOT work properly
@@ -47,5 +62,5 @@ class PrefixFilter(Filter):
 
     def filter(self, record: LogRecord) -> bool:
         # pylint: disable = missing-docstring
-        record.msg = self._separator.join([self._prefix, record.msg])
+        record.msg = self._full_prefix + record.msg
         return True
@@ -6,11 +6,17 @@ import logging
 import os
 import stat
 import sys
+import tempfile
 from os.path import abspath, expanduser, join
 
 from helpers import TestableHandler, environment
 
-from config_resolver import NoVersionError, from_string, get_config
+from config_resolver import (
+    NoVersionError,
+    clear_cache,
+    from_string,
+    get_config,
+)
 
 
 class CommonTests:
@@ -187,6 +193,25 @@ class CommonTests:
             ],
         )
 
+    def test_first_match(self):
+        """
+        With "first_match", only the file with the highest precedence should be
+        loaded.
+        """
+        result = get_config(
+            "world",
+            "hello",
+            lookup_options={
+                "search_path": "{0}:{0}/a:{0}/b".format(self.DATA_PATH),
+                "first_match": True,
+            },
+            handler=self.HANDLER_CLASS,
+        )
+        self.assertEqual(
+            result.meta.loaded_files,
+            [f"{self.DATA_PATH}/b/{self.APP_FILENAME}"],
+        )
+
     def test_filename(self):
         result = get_config(
             "world",
@@ -444,6 +469,19 @@ class CommonTests:
                 result.meta.active_path,
             )
 
+    def test_home_changed_at_runtime(self):
+        """
+        The home folder must be looked up on each call, not only once.
+        """
+        with environment(
+            HOME="/home/somebody", XDG_CONFIG_HOME="", XDG_CONFIG_DIRS=""
+        ):
+            result = get_config("bar", "foo", handler=self.HANDLER_CLASS)
+        self.assertIn(
+            "/home/somebody/.config/foo/bar/%s" % self.APP_FILENAME,
+            result.meta.active_path,
+        )
+
     def test_both_xdg_variables(self):
         with environment(
             XDG_CONFIG_DIRS="/xdgpath1:/xdgpath2",
@@ -507,3 +545,32 @@ class CommonTests:
         """
         result = get_config("world", "hello")
         self.assertIsNotNone(result.meta.prefix_filter)
+
+    def test_cache(self):
+        """
+        Repeated lookups with the "cache" option should return the same result
+        until the cache is cleared.
+        """
+        options = {"search_path": self.DATA_PATH, "cache": True}
+        first = get_config("world", "hello", options, self.HANDLER_CLASS)
+        second = get_config("world", "hello", options, self.HANDLER_CLASS)
+        self.assertIs(first, second)
+        clear_cache()
+        third = get_config("world", "hello", options, self.HANDLER_CLASS)
+        self.assertIsNot(first, third)
+        self.assertEqual(first.meta.loaded_files, third.meta.loaded_files)
+
+    def test_cache_invalidation(self):
+        """
+        Cached results must be discarded if a file in the search path appears
+        """
+        with tempfile.TemporaryDirectory() as tmpdir:
+            options = {"search_path": tmpdir, "cache": True}
+            first = get_config("world", "hello", options, self.HANDLER_CLASS)
+            self.assertEqual(first.meta.loaded_files, [])
+            source = join(self.DATA_PATH, self.APP_FILENAME)
+            target = join(tmpdir, self.APP_FILENAME)
+            with open(source) as infile, open(target, "w") as outfile:
+                outfile.write(infile.read())
+            second = get_config("world", "hello", options, self.HANDLER_CLASS)
+            self.assertEqual(second.meta.loaded_files, [target])
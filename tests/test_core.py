@@ -1,6 +1,7 @@
 import logging
 
 import config_resolver.core as core
+from config_resolver.handler.ini import IniHandler
 
 
 def test_readability_error(caplog):
@@ -26,3 +27,110 @@ def test_prefix_filter_empty():
     logger, prefix_filter = core.prefixed_logger(None)
     assert prefix_filter is None
     assert logger.name == "config_resolver"
+
+
+def test_prefix_filter_reused():
+    """
+    A logger should never receive the same prefix filter twice, even if the
+    cached logger was evicted in the meantime.
+    """
+    config_id = core.ConfigID("acme", "filtered")
+    logger, prefix_filter = core.prefixed_logger(config_id)
+    core.prefixed_logger.cache_clear()
+    logger, second_filter = core.prefixed_logger(config_id)
+    assert second_filter is prefix_filter
+    assert logger.filters == [prefix_filter]
+
+
+def test_result_cache_bounded(tmp_path):
+    """
+    The result cache only keeps a limited number of lookups.
+    """
+    core.clear_cache()
+    for i in range(core._CACHE_SIZE + 5):
+        core.get_config(
+            f"app{i}", "acme", {"search_path": str(tmp_path), "cache": True}
+        )
+    assert len(core._RESULT_CACHE) == core._CACHE_SIZE
+    core.clear_cache()
+
+
+def test_parse_cache(tmp_path):
+    """
+    Parsed files should be reused until they are modified.
+    """
+    filename = tmp_path / "app.ini"
+    filename.write_text("[section]\nvar = 1\n")
+    first = core._parse_file(IniHandler, str(filename), filename.stat())
+    second = core._parse_file(IniHandler, str(filename), filename.stat())
+    assert first is second
+    filename.write_text("[section]\nvar = 22\n")
+    third = core._parse_file(IniHandler, str(filename), filename.stat())
+    assert third.get("section", "var") == "22"
+
+
+def test_parse_cache_bounded(tmp_path):
+    """
+    The parse cache only keeps a limited number of files.
+    """
+    core.clear_cache()
+    for i in range(core._CACHE_SIZE + 5):
+        filename = tmp_path / f"app{i}.ini"
+        filename.write_text("[section]\nvar = 1\n")
+        core._parse_file(IniHandler, str(filename), filename.stat())
+    assert len(core._PARSE_CACHE) == core._CACHE_SIZE
+    core.clear_cache()
+
+
+def test_parse_cache_opt_in():
+    """
+    Parsed files are only kept in memory if caching was requested.
+    """
+    core.clear_cache()
+    lookup_options = {"search_path": "testdata/ini"}
+    core.get_config("world", "hello", lookup_options)
+    assert not core._PARSE_CACHE
+    core.get_config("world", "hello", dict(lookup_options, cache=True))
+    assert core._PARSE_CACHE
+    core.clear_cache()
+
+
+def test_readability_missing_file(caplog):
+    """
+    A missing file is not readable, but it is not an error either.
+    """
+    result = core.is_readable(
+        core.ConfigID("acme", "myapp"), "tests/examples/nonexisting.ini"
+    )
+    assert result.is_readable is False
+    assert result.reason == "File not found"
+    assert not [
+        record for record in caplog.records if record.levelno >= logging.ERROR
+    ]
+
+
+def test_readability_folder(tmp_path):
+    """
+    A folder with the name of the config file is not readable.
+    """
+    folder = tmp_path / "app.ini"
+    folder.mkdir()
+    result = core.is_readable(core.ConfigID("acme", "myapp"), str(folder))
+    assert result.is_readable is False
+    assert result.reason == "Not a regular file"
+
+
+def test_readability_insecure_not_parsed(tmp_path):
+    """
+    In secure mode, world-readable files are rejected without parsing them.
+    """
+    config_file = tmp_path / "app.ini"
+    config_file.write_text("[section]\nkey = value\n")
+    config_file.chmod(0o644)
+    core.clear_cache()
+    result = core.is_readable(
+        core.ConfigID("acme", "myapp"), str(config_file), secure=True
+    )
+    assert result.is_readable is False
+    assert result.parsed is None
+    assert not core._PARSE_CACHE
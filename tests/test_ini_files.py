@@ -2,11 +2,13 @@
 Tests the default "INI" file handler.
 """
 import unittest
-from configparser import ConfigParser
+from configparser import ConfigParser, Error
 from textwrap import dedent
 
+import pytest
 from common import CommonTests
 
+from config_resolver import get_config
 from config_resolver.handler.ini import IniHandler
 
 
@@ -30,3 +32,127 @@ class IniTest(CommonTests, unittest.TestCase):
 
     def _sections(self, config):
         return set(config.sections())
+
+
+@pytest.mark.parametrize(
+    "data",
+    [
+        "[a]\nx = 1\ny: 2\n# comment\n; comment\n\n[b]\nz=3\n",
+        "[DEFAULT]\nx = 1\n[a]\ny = %(x)s\n",
+        "[a]\nx = 100%\n",
+        "[a]\nx = multi\n  line\n",
+        "[a]\nKey = 1\n",
+        "[a]\nx = 1 ; not a comment\n",
+        "[a]\nKey = 1\nkey = 2\n",
+        "[a]\n[a] = b\n",
+        "[a]\n[a] # k=v\n",
+        "[b]\nx = 1\n[a] = b\ny = 2\n",
+        "[b]\n[a] # k=v\nz = 1\n",
+    ],
+)
+def test_fast_parser_consistency(tmp_path, data):
+    """
+    Simple INI files are loaded with a faster parser. Ensure that this yields
+    the same values (or errors) as the stdlib parser.
+    """
+    filename = tmp_path / "app.ini"
+    filename.write_text(data)
+    expected = ConfigParser()
+    try:
+        expected.read_string(data)
+    except Error as exc:
+        with pytest.raises(type(exc)):
+            IniHandler.from_filename(str(filename))
+        return
+
+    result = IniHandler.from_filename(str(filename))
+
+    assert result.sections() == expected.sections()
+    assert result.defaults() == expected.defaults()
+    for section in expected.sections():
+        assert result.items(section, raw=True) == expected.items(
+            section, raw=True
+        )
+
+
+def test_as_dict():
+    config = IniHandler.from_string(
+        dedent(
+            """\
+            [DEFAULT]
+            base = /tmp
+
+            [paths]
+            data = %(base)s/data
+            """
+        )
+    )
+    assert IniHandler.as_dict(config) == {
+        "paths": {"base": "/tmp", "data": "/tmp/data"}
+    }
+
+
+def test_update_from_config():
+    config = IniHandler.from_string("[DEFAULT]\na = 1\n[s1]\nb = 2\nc = 3\n")
+    other = IniHandler.from_string("[DEFAULT]\nd = 4\n[s1]\nc = 5\n[s2]\ne = 6")
+    IniHandler.update_from_config(config, other)
+    assert IniHandler.as_dict(config) == {
+        "s1": {"a": "1", "b": "2", "c": "5", "d": "4"},
+        "s2": {"a": "1", "d": "4", "e": "6"},
+    }
+    # The source instance must remain untouched
+    assert IniHandler.as_dict(other) == {
+        "s1": {"c": "5", "d": "4"},
+        "s2": {"d": "4", "e": "6"},
+    }
+
+
+def test_loaded_config_is_not_shared():
+    """
+    Modifying a loaded config must not leak into later lookups.
+    """
+    options = {"search_path": "testdata/ini"}
+    first = get_config("world", "hello", options).config
+    first.set("section1", "var1", "modified")
+    second = get_config("world", "hello", options).config
+    assert second.get("section1", "var1") == "foo"
+
+
+def test_custom_update_from_file():
+    """
+    Handlers which only override "update_from_file" must still have that
+    method called when files are merged.
+    """
+    loaded = []
+
+    class CustomHandler(IniHandler):
+        @staticmethod
+        def update_from_file(config, filename):
+            loaded.append(filename)
+            IniHandler.update_from_file(config, filename)
+
+    result = get_config(
+        "world", "hello", {"search_path": "testdata/ini"}, CustomHandler
+    )
+    assert loaded == ["testdata/ini/app.ini"]
+    assert result.config.get("section1", "var1") == "foo"
+
+
+def test_custom_empty(tmp_path):
+    """
+    Handlers which override "empty" (here to keep the case of option names)
+    must be merged using "update_from_file".
+    """
+    (tmp_path / "app.ini").write_text("[section]\nMyKey = 1\n")
+
+    class CaseSensitiveHandler(IniHandler):
+        @staticmethod
+        def empty():
+            config = ConfigParser()
+            config.optionxform = str  # type: ignore
+            return config
+
+    result = get_config(
+        "app", "acme", {"search_path": str(tmp_path)}, CaseSensitiveHandler
+    )
+    assert dict(result.config["section"]) == {"MyKey": "1"}